@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Flight search with Pydantic validation.
+Flight search with Pydantic input validation.
 Supports Skyscanner, Google Flights, and Booking.com via Brave Search API.
 """
 
@@ -9,16 +9,43 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
 
 import sys
-import json
+import hashlib
+import logging
 import time
+import threading
+import orjson
 import requests
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, List, Literal
-from datetime import datetime
+from datetime import date
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from enum import Enum
 
 
+logger = logging.getLogger(__name__)
+
+# Precompiled patterns for the per-result parsing hot path
+_PRICE_RE = re.compile(r'[$£€][\d,]+(?:\.\d{2})?')  # $485, £485, €1,234.56
+_PRICE_CLEAN_RE = re.compile(r'[$£€,]')
+_URL_PREFIXES = ('http://', 'https://')
+
+# Default location for cached API responses, shared across CLI runs
+_DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'flight-finder'
+)
+# Names written by the response cache (entries and in-progress temp files); pruning
+# only ever touches these, so a shared cache_dir keeps its other files
+_CACHE_FILE_RE = re.compile(r'^[0-9a-f]{64}\.json(?:\.\d+\.\d+\.tmp)?$')
+
+# Brave Search returns at most 20 web results per request
+_MAX_RESULT_COUNT = 20
+
+
 class WebsiteName(str, Enum):
     """Supported flight booking websites."""
     SKYSCANNER = "skyscanner"
@@ -47,21 +74,24 @@ class FlightSearchParams(BaseModel):
     @classmethod
     def validate_airport_code(cls, v: str) -> str:
         """Validate and normalize airport codes."""
-        v = v.strip().upper()
-        if not re.match(r'^[A-Z]{3}$', v):
+        v = v.strip()
+        if len(v) != 3 or not (v.isascii() and v.isalpha()):
             raise ValueError(f"Invalid airport code: {v}. Must be 3 letters (e.g., JFK)")
-        return v
+        return v.upper()
 
     @field_validator('depart_date')
     @classmethod
     def validate_date(cls, v: str) -> str:
         """Validate date format and ensure it's not in the past."""
         try:
-            date_obj = datetime.strptime(v, '%Y-%m-%d')
+            # fromisoformat also accepts forms like 20260515, so require the dashed shape
+            if len(v) != 10 or v[4] != '-' or v[7] != '-':
+                raise ValueError
+            date_obj = date.fromisoformat(v)
         except ValueError:
             raise ValueError(f"Invalid date format: {v}. Must be YYYY-MM-DD (e.g., 2026-05-15)")
 
-        if date_obj.date() < datetime.now().date():
+        if date_obj < date.today():
             raise ValueError(f"Date cannot be in the past: {v}")
 
         return v
@@ -69,62 +99,70 @@ class FlightSearchParams(BaseModel):
     model_config = ConfigDict(frozen=True)
 
 
-class FlightResult(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class FlightResult:
     """Individual flight search result."""
-    title: str = Field(..., description="Result title")
-    url: str = Field(..., description="Booking URL")
-    description: str = Field(..., description="Result description")
-    price: Optional[str] = Field(None, description="Extracted price (e.g., $485)")
-    website: str = Field(..., description="Source website name")
+    title: str                          # Result title
+    url: str                            # Booking URL
+    description: str                    # Result description
+    price: Optional[str] = None         # Extracted price (e.g., $485)
+    website: str                        # Source website name
 
-    @field_validator('url')
-    @classmethod
-    def validate_url(cls, v: str) -> str:
+    def __post_init__(self) -> None:
         """Ensure URL is valid."""
-        if not v.startswith(('http://', 'https://')):
-            raise ValueError(f"Invalid URL: {v}")
-        return v
+        if not self.url.startswith(_URL_PREFIXES):
+            raise ValueError(f"Invalid URL: {self.url}")
 
 
-class SearchResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SearchResponse:
     """Response from a single website search."""
-    website: str = Field(..., description="Website that was searched")
-    query: str = Field(..., description="Search query used")
-    results: List[FlightResult] = Field(default_factory=list, description="List of flight results")
-    cheapest: Optional[FlightResult] = Field(None, description="Cheapest flight found")
-    count: int = Field(..., ge=0, description="Number of results found")
+    website: str                                            # Website that was searched
+    query: str                                              # Search query used
+    results: List[FlightResult] = field(default_factory=list)  # List of flight results
+    cheapest: Optional[FlightResult] = None                 # Cheapest flight found
+    count: int                                              # Number of results found
 
 
-class ComparisonItem(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ComparisonItem:
     """Price comparison for a single website."""
-    website: str = Field(..., description="Website name")
-    cheapest_price: str = Field(..., description="Cheapest price on this site")
-    url: str = Field(..., description="URL to cheapest option")
-    is_best: bool = Field(..., description="Whether this is the overall best price")
+    website: str            # Website name
+    cheapest_price: str     # Cheapest price on this site
+    url: str                # URL to cheapest option
+    is_best: bool           # Whether this is the overall best price
 
 
-class BestDeal(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class BestDeal:
     """Best deal found across all sites."""
-    website: str = Field(..., description="Website name")
-    price: str = Field(..., description="Best price found")
-    url: str = Field(..., description="URL to the best deal")
-    title: str = Field(..., description="Result title")
+    website: str    # Website name
+    price: str      # Best price found
+    url: str        # URL to the best deal
+    title: str      # Result title
 
 
-class ComparisonResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ComparisonResponse:
     """Response from comparing multiple websites."""
-    mode: Literal["comparison"] = Field(default="comparison", description="Response mode")
-    sites_checked: int = Field(..., ge=0, le=3, description="Number of sites checked")
-    comparison: List[ComparisonItem] = Field(..., description="Price comparison across sites")
-    best_deal: BestDeal = Field(..., description="Best deal found overall")
-    all_results: List[SearchResponse] = Field(..., description="Full results from all sites")
+    mode: Literal["comparison"] = "comparison"  # Response mode
+    sites_checked: int                          # Number of sites checked
+    comparison: List[ComparisonItem]            # Price comparison across sites
+    best_deal: BestDeal                         # Best deal found overall
+    all_results: List[SearchResponse]           # Full results from all sites
 
 
-class ErrorResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ErrorResponse:
     """Error response."""
-    error: str = Field(..., description="Error message")
-    suggestion: Optional[str] = Field(None, description="Suggestion to fix the error")
-    sites_checked: Optional[List[str]] = Field(None, description="Sites that were checked")
+    error: str                                  # Error message
+    suggestion: Optional[str] = None            # Suggestion to fix the error
+    sites_checked: Optional[List[str]] = None   # Sites that were checked
+
+
+def to_json(obj) -> str:
+    """Render a response (or plain dict) as indented JSON."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
 
 
 # Website configurations
@@ -150,19 +188,81 @@ WEBSITES: dict[WebsiteName, WebsiteConfig] = {
 class FlightSearcher:
     """Flight search service using Brave Search API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_ttl: float = 300,
+        count: int = 10,
+        rate_limit: float = 1.0,
+        rate_burst: int = 2,
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialize the flight searcher.
         
         Args:
             api_key: Brave Search API key. If None, uses BRAVE_API_KEY env var.
+            cache_ttl: Seconds to reuse an API response for an identical query (0 disables caching).
+                Responses are stored on disk so repeat CLI invocations can hit the cache.
+            count: Number of search results to request per site (1-20).
+            rate_limit: Sustained API requests per second, shared across comparison
+                threads. The default matches Brave's free tier; use 0 to disable.
+            rate_burst: Requests that may go out back-to-back before rate_limit applies.
+            cache_dir: Directory for cached responses. Defaults to ~/.cache/flight-finder.
         """
         self.api_key = api_key or os.environ.get('BRAVE_API_KEY')
         if not self.api_key:
             raise ValueError("BRAVE_API_KEY must be set in environment or passed as argument")
+        if not 1 <= count <= _MAX_RESULT_COUNT:
+            raise ValueError(f"count must be between 1 and {_MAX_RESULT_COUNT}")
+        if rate_burst < 1:
+            raise ValueError("rate_burst must be at least 1")
         
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
         self.timeout = 30
+        self.count = count
+
+        # Shared keep-alive session so repeated searches skip the TCP/TLS handshake
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            # Retry connect failures and 429/5xx only; a read timeout must surface
+            # as requests.Timeout rather than multiplying the 30s budget
+            max_retries=Retry(
+                total=2,
+                read=False,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "X-Subscription-Token": self.api_key,
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip"
+        })
+
+        # Token bucket pacing requests from concurrent comparison searches
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self._tokens = float(rate_burst)
+        self._tokens_updated_at = time.monotonic()
+        self._rate_lock = threading.Lock()
+
+        # Prices change on the order of minutes, so repeat queries are served from disk
+        self.cache_ttl = cache_ttl
+        self.cache_dir = cache_dir or _DEFAULT_CACHE_DIR
+
+    def close(self) -> None:
+        """Release pooled connections held by the shared session."""
+        self.session.close()
+
+    def __enter__(self) -> "FlightSearcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def search_flights(self, params: FlightSearchParams) -> SearchResponse | ErrorResponse:
         """
@@ -190,22 +290,21 @@ class FlightSearcher:
         )
         
         try:
-            response = requests.get(
-                self.base_url,
-                headers={
-                    "X-Subscription-Token": self.api_key,
-                    "Accept": "application/json",
-                    "Accept-Encoding": "gzip"
-                },
-                params={
-                    "q": query,
-                    "count": 10,
-                    "search_lang": "en"
-                },
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_cached(query)
+            if data is None:
+                self._wait_for_rate_limit()
+                response = self.session.get(
+                    self.base_url,
+                    params={
+                        "q": query,
+                        "count": self.count,
+                        "search_lang": "en"
+                    },
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                self._store_cached(query, response.content)
             
             # Parse results
             results = self._parse_results(data, site_config)
@@ -214,9 +313,10 @@ class FlightSearcher:
             results_with_price = [r for r in results if r.price]
             results_without_price = [r for r in results if not r.price]
             
+            # sort() calls the key once per result, so each price is parsed once
             results_with_price.sort(key=lambda x: self._parse_price(x.price))
             
-            final_results = (results_with_price + results_without_price)[:10]
+            final_results = (results_with_price + results_without_price)[:self.count]
             
             return SearchResponse(
                 website=site_config.name,
@@ -253,21 +353,24 @@ class FlightSearcher:
             ComparisonResponse with comparison or ErrorResponse on failure
         """
         sites_to_check = [WebsiteName.SKYSCANNER, WebsiteName.GOOGLE, WebsiteName.BOOKING]
-        all_results: List[SearchResponse] = []
+        results_by_site: dict[WebsiteName, SearchResponse] = {}
         
-        for i, site in enumerate(sites_to_check):
-            if i > 0:
-                time.sleep(0.5)
-            search_params = FlightSearchParams(
-                origin=params.origin,
-                destination=params.destination,
-                depart_date=params.depart_date,
-                website=site
-            )
-            result = self.search_flights(search_params)
-
-            if isinstance(result, SearchResponse) and result.cheapest:
-                all_results.append(result)
+        # Searches are independent and network-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(sites_to_check)) as executor:
+            futures = {
+                # params is already validated, so copy it without re-running validators
+                executor.submit(self.search_flights, params.model_copy(update={'website': site})): site
+                for site in sites_to_check
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                if isinstance(result, SearchResponse) and result.cheapest:
+                    results_by_site[futures[future]] = result
+        
+        # Keep site priority order regardless of completion order
+        all_results: List[SearchResponse] = [
+            results_by_site[site] for site in sites_to_check if site in results_by_site
+        ]
         
         if not all_results:
             return ErrorResponse(
@@ -276,22 +379,20 @@ class FlightSearcher:
                 suggestion="Try different dates or check the sites directly"
             )
         
-        # Find overall cheapest
-        best_deal = min(all_results, key=lambda x: self._parse_price(x.cheapest.price))
+        # Sort once by price; the first entry is the overall cheapest
+        by_price = sorted(all_results, key=lambda x: self._parse_price(x.cheapest.price))
+        best_deal = by_price[0]
         
         # Create comparison summary
-        comparison_summary: List[ComparisonItem] = []
-        for result in all_results:
-            if result.cheapest:
-                comparison_summary.append(ComparisonItem(
-                    website=result.website,
-                    cheapest_price=result.cheapest.price,
-                    url=result.cheapest.url,
-                    is_best=result.website == best_deal.website
-                ))
-        
-        # Sort by price
-        comparison_summary.sort(key=lambda x: self._parse_price(x.cheapest_price))
+        comparison_summary: List[ComparisonItem] = [
+            ComparisonItem(
+                website=result.website,
+                cheapest_price=result.cheapest.price,
+                url=result.cheapest.url,
+                is_best=i == 0
+            )
+            for i, result in enumerate(by_price)
+        ]
         
         return ComparisonResponse(
             mode="comparison",
@@ -306,6 +407,86 @@ class FlightSearcher:
             all_results=all_results
         )
 
+    def _wait_for_rate_limit(self) -> None:
+        """Block until the token bucket allows this thread's next API request."""
+        if self.rate_limit <= 0:
+            return
+        
+        # Take a token under the lock (going negative reserves a future one),
+        # then sleep outside it until that token has refilled
+        with self._rate_lock:
+            now = time.monotonic()
+            elapsed = now - self._tokens_updated_at
+            self._tokens = min(self.rate_burst, self._tokens + elapsed * self.rate_limit)
+            self._tokens_updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate_limit if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+
+    def _cache_path(self, query: str) -> str:
+        """Return the cache file for a query (the result count is part of the key)."""
+        key = hashlib.sha256(f"{self.count}:{query}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _get_cached(self, query: str) -> Optional[dict]:
+        """Return the cached API response for a query, or None if missing, expired or corrupt."""
+        if self.cache_ttl <= 0:
+            return None
+        
+        path = self._cache_path(query)
+        try:
+            if time.time() - os.path.getmtime(path) >= self.cache_ttl:
+                return None
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            return None
+        
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Treat a corrupt entry as a miss and drop it so the next write replaces it
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _store_cached(self, query: str, content: bytes) -> None:
+        """Cache an API response body and drop expired entries. Failures are ignored."""
+        if self.cache_ttl <= 0:
+            return
+        
+        path = self._cache_path(query)
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        
+        self._prune_cache()
+
+    def _prune_cache(self) -> None:
+        """Remove expired cache entries and stale temp files written by this cache."""
+        cutoff = time.time() - self.cache_ttl
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if _CACHE_FILE_RE.match(entry.name) and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except OSError:
+            pass
+
     def _parse_results(self, data: dict, site_config: WebsiteConfig) -> List[FlightResult]:
         """Parse search API response into FlightResult objects."""
         results: List[FlightResult] = []
@@ -318,45 +499,37 @@ class FlightSearcher:
             if not url:
                 continue
             
+            # Only include results from the target domain (Brave URLs are
+            # usually already lowercase, so only lowercase on a miss)
+            if site_config.domain not in url and site_config.domain not in url.lower():
+                continue
+            
             # Extract price
             price = self._extract_price(title + ' ' + description)
             
-            # Verify result is from target domain
-            domain_match = site_config.domain in url.lower()
+            # Truncate long descriptions
+            truncated_desc = description[:200] + '...' if len(description) > 200 else description
             
-            if domain_match:  # Only include results from the target domain
-                # Truncate long descriptions
-                truncated_desc = description[:200] + '...' if len(description) > 200 else description
-                
-                try:
-                    results.append(FlightResult(
-                        title=title,
-                        url=url,
-                        description=truncated_desc,
-                        price=price,
-                        website=site_config.name
-                    ))
-                except Exception as e:
-                    # Skip invalid results
-                    print(f"Skipping invalid result: {e}", file=sys.stderr)
-                    continue
+            try:
+                results.append(FlightResult(
+                    title=title,
+                    url=url,
+                    description=truncated_desc,
+                    price=price,
+                    website=site_config.name
+                ))
+            except Exception as e:
+                # Skip invalid results
+                logger.debug("Skipping invalid result: %s", e)
+                continue
         
         return results
 
     @staticmethod
     def _extract_price(text: str) -> Optional[str]:
         """Extract price from text - supports $, £, €."""
-        patterns = [
-            r'\$[\d,]+(?:\.\d{2})?',  # $485 or $1,234.56
-            r'£[\d,]+(?:\.\d{2})?',   # £485
-            r'€[\d,]+(?:\.\d{2})?',   # €485
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(0)
-        return None
+        match = _PRICE_RE.search(text)
+        return match.group(0) if match else None
 
     @staticmethod
     def _parse_price(price_str: Optional[str]) -> float:
@@ -365,7 +538,7 @@ class FlightSearcher:
             return float('inf')
         
         # Remove currency symbols and commas
-        clean = re.sub(r'[$£€,]', '', price_str)
+        clean = _PRICE_CLEAN_RE.sub('', price_str)
         try:
             return float(clean)
         except ValueError:
@@ -391,7 +564,7 @@ def main():
                 "compare": "Check all three sites and compare"
             }
         }
-        print(json.dumps(usage, indent=2))
+        print(to_json(usage))
         sys.exit(1)
     
     origin = sys.argv[1]
@@ -407,7 +580,7 @@ def main():
             error=f"Invalid website: {website_str}",
             suggestion=f"Use one of: {', '.join([w.value for w in WebsiteName])}"
         )
-        print(json.dumps(error.model_dump(), indent=2))
+        print(to_json(error))
         sys.exit(1)
     
     # Create search parameters
@@ -423,34 +596,33 @@ def main():
             error=f"Invalid parameters: {str(e)}",
             suggestion="Check your airport codes (3 letters) and date format (YYYY-MM-DD)"
         )
-        print(json.dumps(error.model_dump(), indent=2))
+        print(to_json(error))
         sys.exit(1)
     
     # Execute search
     try:
-        searcher = FlightSearcher()
-        
-        if website == WebsiteName.COMPARE:
-            result = searcher.search_all_sites(params)
-        else:
-            result = searcher.search_flights(params)
+        with FlightSearcher() as searcher:
+            if website == WebsiteName.COMPARE:
+                result = searcher.search_all_sites(params)
+            else:
+                result = searcher.search_flights(params)
         
         # Output result as JSON
-        print(json.dumps(result.model_dump(), indent=2))
+        print(to_json(result))
         
     except ValueError as e:
         error = ErrorResponse(
             error=str(e),
             suggestion="Make sure BRAVE_API_KEY environment variable is set"
         )
-        print(json.dumps(error.model_dump(), indent=2))
+        print(to_json(error))
         sys.exit(1)
     except Exception as e:
         error = ErrorResponse(
             error=f"Unexpected error: {str(e)}",
             suggestion="Contact support if this persists"
         )
-        print(json.dumps(error.model_dump(), indent=2))
+        print(to_json(error))
         sys.exit(1)
 
 